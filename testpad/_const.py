@@ -1,10 +1,32 @@
 import sys
-from importlib.metadata import version
-
-VERSION = str(version("testpad-python"))
-_python_version = ".".join(str(v) for v in sys.version_info[:2])
-_requests_version = str(version("requests"))
-DEFAULT_USER_AGENT = (
-    f"testpad-python [t{VERSION}::p{_python_version}::r{_requests_version}]"
-)
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+
 TESTPAD_API = "https://api.testpad.com/api/v1/"
+
+
+@lru_cache(maxsize=None)
+def _package_version(name: str) -> str:
+    try:
+        return str(version(name))
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@lru_cache(maxsize=None)
+def _default_user_agent() -> str:
+    python_version = ".".join(str(v) for v in sys.version_info[:2])
+    return (
+        f"testpad-python [t{_package_version('testpad-python')}"
+        f"::p{python_version}::r{_package_version('requests')}]"
+    )
+
+
+def __getattr__(name: str):
+    # VERSION and DEFAULT_USER_AGENT are only computed when first used, as reading
+    # the installed package metadata is slow and not needed just to import testpad
+    if name == "VERSION":
+        return _package_version("testpad-python")
+    if name == "DEFAULT_USER_AGENT":
+        return _default_user_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
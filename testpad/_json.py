@@ -0,0 +1,24 @@
+import json
+from typing import Any
+
+# request and response bodies are encoded with orjson if it is installed, as it is
+# considerably faster than the standard library json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+
+    def json_dumps(data: Any) -> bytes:
+        # non-string dict keys (eg test IDs given as ints) are converted as json.dumps would
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+    json_loads = orjson.loads
+
+else:
+
+    def json_dumps(data: Any) -> bytes:
+        return json.dumps(data).encode("utf-8")
+
+    json_loads = json.loads
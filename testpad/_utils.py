@@ -1,18 +1,154 @@
-from typing import Any, Dict, Union
+from collections import OrderedDict
+from http import HTTPStatus
+from threading import Lock
+from typing import Any, Dict, FrozenSet, Hashable, Optional, Union
 
+from requests import Response
+
+from . import _const
+from .exceptions import (
+    ActionNotAllowed,
+    APIServerError,
+    BadRequest,
+    IncorrectMethod,
+    NotFound,
+    RateLimitExceeded,
+    UnexpectedResponse,
+    parse_error_body,
+)
 from .models import Folder, Note, Script
 
+# constructors for the item types that have no nested contents, keyed by their "type" value
+_LEAF_BUILDERS = {"script": Script, "note": Note}
+
+# The statuses accepted by each kind of request, as plain ints in frozensets. These are built
+# once here, as looking up HTTPStatus members is comparatively slow to do on every request.
+STATUS_OK = frozenset({HTTPStatus.OK.value})
+STATUS_OK_OR_CREATED = frozenset({HTTPStatus.OK.value, HTTPStatus.CREATED.value})
+STATUS_OK_OR_NOT_MODIFIED = frozenset(
+    {HTTPStatus.OK.value, HTTPStatus.NOT_MODIFIED.value}
+)
+STATUS_NO_CONTENT = frozenset({HTTPStatus.NO_CONTENT.value})
+
+# the exception raised for each error status the API is known to return - any other
+# status that a request does not accept raises UnexpectedResponse
+_STATUS_EXCEPTIONS = {
+    HTTPStatus.UNAUTHORIZED.value: ActionNotAllowed,
+    HTTPStatus.FORBIDDEN.value: ActionNotAllowed,
+    HTTPStatus.BAD_REQUEST.value: BadRequest,
+    HTTPStatus.NOT_FOUND.value: NotFound,
+    HTTPStatus.METHOD_NOT_ALLOWED.value: IncorrectMethod,
+    HTTPStatus.TOO_MANY_REQUESTS.value: RateLimitExceeded,
+    HTTPStatus.INTERNAL_SERVER_ERROR.value: APIServerError,
+}
+
+
+def normalise_api_url(api_url: Optional[str]) -> str:
+    """
+    Returns the base API URL to use, ending with a slash so that endpoint paths can be appended to it
+    """
+    if api_url is None:
+        api_url = _const.TESTPAD_API
+    return api_url.rstrip("/") + "/"
+
+
+def endpoint_url(base_url: str, path: str) -> str:
+    """
+    Returns the full URL of an endpoint, given a base URL from `normalise_api_url`
+    """
+    # the base URL always ends with a single slash, so joining is a plain concatenation
+    return base_url + path.lstrip("/")
+
+
+def default_headers(token: str, user_agent: Optional[str]) -> Dict[str, str]:
+    """
+    Returns the headers sent with every request, including auth
+    """
+    if user_agent is None:
+        user_agent = _const.DEFAULT_USER_AGENT
+    return {
+        "User-Agent": user_agent,
+        "Authorization": f"apikey {token}",
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+    }
+
 
 def parse_folder_contents(item: Dict[str, Any]) -> Union[Folder, Script, Note]:
-    if item["type"] == "script":
-        return Script(**item)
-    elif item["type"] == "note":
-        return Note(**item)
-    elif item["type"] == "folder":
-        # first coerce the contents list into correct types
-        if "contents" in item:
-            item["contents"] = [parse_folder_contents(nested_item) for nested_item in item["contents"]]
+    """
+    Converts an item of folder contents from the API, and everything nested beneath it, into models.
+
+    The tree is walked with an explicit stack rather than by recursion, so deep folder structures
+    cannot hit the recursion limit. Each stack entry is (parent list, index in it, node, contents),
+    where contents is None on the first visit to a node; folders are pushed back with their
+    converted contents list and built on the second visit, once all their children are done.
+    Scripts and notes inside a folder are converted as soon as the folder is visited.
+    """
+    leaf_builders, folder = _LEAF_BUILDERS, Folder
+
+    result = [None]
+    stack = [(result, 0, item, None)]
+    while stack:
+        parent, index, node, contents = stack.pop()
+        node_type = node["type"]
+        builder = leaf_builders.get(node_type)
+        if builder is not None:
+            parent[index] = builder(**node)
+        elif node_type == "folder":
+            if contents is not None:
+                parent[index] = folder(**{**node, "contents": contents})
+                continue
+            children = node.get("contents", ())
+            contents = [None] * len(children)
+            stack.append((parent, index, node, contents))
+            # convert scripts and notes straight away, so only subfolders go through the stack
+            for i, child in enumerate(children):
+                child_builder = leaf_builders.get(child["type"])
+                if child_builder is not None:
+                    contents[i] = child_builder(**child)
+                else:
+                    stack.append((contents, i, child, None))
         else:
-            item["contents"] = []
-        return Folder(**item)
-    raise ValueError(f"Unexpected type: {item['type']}")
+            raise ValueError(f"Unexpected type: {node_type}")
+    return result[0]
+
+
+def check_response(resp: Response, accepted_responses: FrozenSet[int]):
+    """
+    Raises the matching client exception if the response status is not one of those accepted.
+    This is shared by the synchronous and asynchronous clients.
+    """
+    if resp.status_code in accepted_responses:
+        return
+    # the body is parsed once here, and kept on the exception for the caller to inspect
+    body = parse_error_body(resp)
+    raise _STATUS_EXCEPTIONS.get(resp.status_code, UnexpectedResponse)(resp, body)
+
+
+class LRUCache:
+    """
+    A small thread-safe mapping which discards the least recently used entry once it is full
+    """
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,286 @@
+import asyncio
+from typing import (
+    Any,
+    Awaitable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import httpx
+
+from . import models
+from ._const import TESTPAD_API
+from ._json import json_loads
+from ._utils import (
+    STATUS_OK,
+    check_response,
+    default_headers,
+    endpoint_url,
+    normalise_api_url,
+    parse_folder_contents,
+)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 64
+
+
+class AsyncTestpad:
+    """
+    An asyncio version of the Testpad client, for issuing many API calls concurrently. It covers the
+    endpoints for fetching data - use `Testpad` to make changes.
+
+    This requires the optional ``httpx`` dependency, installed with ``pip install testpad-python[async]``.
+    The client should be closed when finished with, either by using it as an async context manager
+    or by awaiting ``aclose()``.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        *,
+        api_url: str = TESTPAD_API,
+        user_agent: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        http2: bool = False,
+        client: httpx.AsyncClient = None,
+    ):
+        """
+        Required parameters:
+
+        :param token:
+            The API token made at https://testpad.com/ to access the API
+
+        Optional parameters:
+
+        :param api_url:
+            The base API URL. The default is for live testpad.com, but you can switch this for testing and development
+        :param user_agent:
+            Override the default user agent used to send in requests
+        :param max_concurrency:
+            The maximum number of requests the batch methods will have in flight at once, which is also
+            used as the connection pool size of the default client
+        :param http2:
+            Use HTTP/2 for the default client, so that concurrent requests are multiplexed over a single
+            connection rather than each needing their own. This needs the ``h2`` package, installed
+            with ``pip install testpad-python[http2]``
+        :param client:
+            Use this to override the default httpx AsyncClient object
+        """
+        self._token = token
+        self._base_url = normalise_api_url(api_url)
+
+        self._max_concurrency = max_concurrency
+        self._client = client or httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+        )
+
+        # set default headers including auth
+        self._client.headers.update(default_headers(token, user_agent))
+
+    async def __aenter__(self) -> "AsyncTestpad":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    # ---
+    # HTTP utility methods
+    # ---
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        accepted_responses: FrozenSet[int],
+        *,
+        query_params: Optional[Dict[str, str]] = None,
+        **client_kwargs,
+    ) -> httpx.Response:
+        url = endpoint_url(self._base_url, path)
+        resp = await self._client.request(
+            str(method),
+            url,
+            params=query_params,
+            **client_kwargs,
+        )
+        check_response(resp, accepted_responses)
+        return resp
+
+    async def _get(self, path: str, params: Dict[str, str] = None) -> Dict[str, Any]:
+        resp = await self._request("GET", path, STATUS_OK, query_params=params)
+        return json_loads(resp.content)
+
+    async def _gather(self, aws: Iterable[Awaitable[T]]) -> List[T]:
+        """
+        Runs the given awaitables concurrently, with at most `max_concurrency` of them in flight at once,
+        and returns their results in the same order.
+        """
+        # the semaphore is created here so that it is bound to the running event loop
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def limited(aw: Awaitable[T]) -> T:
+            async with semaphore:
+                return await aw
+
+        return list(await asyncio.gather(*(limited(aw) for aw in aws)))
+
+    # ---
+    # Utilities
+    # ---
+
+    async def whoami(self) -> Tuple[models.Company, models.ApiKey]:
+        data = await self._get("whoami")
+        company = models.Company(**data["company"])
+        key = models.ApiKey(**data["apikey"])
+        return company, key
+
+    # ---
+    # Projects
+    # ---
+
+    async def get_project(self, project_id: int) -> models.Project:
+        data = await self._get(f"projects/{project_id}")
+        return models.Project.from_api(data["project"])
+
+    async def get_projects(self, project_ids: Iterable[int]) -> List[models.Project]:
+        """
+        Fetches several projects concurrently.
+
+        :param project_ids:
+            The IDs of the projects to fetch
+        :return:
+            The projects, in the same order as the IDs given
+        """
+        return await self._gather(self.get_project(pid) for pid in project_ids)
+
+    async def list_projects(self) -> List[models.Project]:
+        data = await self._get("projects")
+        return list(map(models.Project.from_api, data["projects"]))
+
+    async def get_project_contents(
+        self, project_id: int
+    ) -> list[Union[models.Folder, models.Script, models.Note]]:
+        data = await self._get(f"projects/{project_id}/folders")
+        return [parse_folder_contents(obj) for obj in data["folders"]]
+
+    async def list_project_details(
+        self, project_ids: Optional[Iterable[int]] = None
+    ) -> List[
+        Tuple[models.Project, List[Union[models.Folder, models.Script, models.Note]]]
+    ]:
+        """
+        Fetches projects together with their contents, with all the requests for contents made
+        concurrently rather than one after another.
+
+        :param project_ids:
+            The IDs of the projects to fetch. If not given, every project is fetched
+        :return:
+            A list of (project, contents) pairs, in the same order as the projects
+        """
+        if project_ids is None:
+            projects = await self.list_projects()
+        else:
+            projects = await self.get_projects(project_ids)
+        contents = await self._gather(
+            self.get_project_contents(project.id) for project in projects
+        )
+        return list(zip(projects, contents))
+
+    # ---
+    # Notes
+    # ---
+
+    async def list_project_notes(self, project_id: int) -> List[models.Note]:
+        data = await self._get(f"projects/{project_id}/notes")
+        return list(map(models.Note.from_api, data["notes"]))
+
+    async def list_folder_notes(
+        self, project_id: int, folder_id: str
+    ) -> List[models.Note]:
+        data = await self._get(f"projects/{project_id}/folders/{folder_id}/notes")
+        return list(map(models.Note.from_api, data["notes"]))
+
+    # ---
+    # Folders
+    # ---
+
+    async def get_folder(
+        self, project_id: int, folder_id: str, subfolders: bool = True
+    ) -> models.Folder:
+        url = f"projects/{project_id}/folders/{folder_id}"
+        if not subfolders:
+            url = f"{url}?subfolders=none"
+        data = await self._get(url)
+        return parse_folder_contents(data["folder"])
+
+    async def get_folders(
+        self, project_id: int, folder_ids: Iterable[str], subfolders: bool = True
+    ) -> List[models.Folder]:
+        """
+        Fetches several folders from the same project concurrently.
+
+        :param project_id:
+            The project the folders belong to
+        :param folder_ids:
+            The IDs of the folders to fetch
+        :param subfolders:
+            Whether to include the subfolders of each folder
+        :return:
+            The folders, in the same order as the IDs given
+        """
+        return await self._gather(
+            self.get_folder(project_id, fid, subfolders) for fid in folder_ids
+        )
+
+    # ---
+    # Scripts
+    # ---
+
+    async def get_script(self, script_id: int) -> models.Script:
+        data = await self._get(f"scripts/{script_id}")
+        return models.Script(**data["script"])
+
+    async def get_scripts(self, script_ids: Iterable[int]) -> List[models.Script]:
+        """
+        Fetches several scripts concurrently.
+
+        :param script_ids:
+            The IDs of the scripts to fetch
+        :return:
+            The scripts, in the same order as the IDs given
+        """
+        return await self._gather(self.get_script(sid) for sid in script_ids)
+
+    # ---
+    # Tests (also called "cases")
+    # ---
+
+    async def get_test(self, script_id: int, test_id: int) -> models.Test:
+        data = await self._get(f"scripts/{script_id}/tests/{test_id}")
+        return models.Test.from_api(data["test"])
+
+    async def list_tests(self, script_id: int) -> List[models.Test]:
+        data = await self._get(f"scripts/{script_id}/tests")
+        return list(map(models.Test.from_api, data["tests"]))
+
+    # ---
+    # Runs
+    # ---
+
+    async def get_run(self, script_id: int, run_id: int) -> models.Run:
+        data = await self._get(f"scripts/{script_id}/runs/{run_id}")
+        return models.Run(**data["run"])
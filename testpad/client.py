@@ -1,34 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
-from typing import Any, Dict, List, Optional, Tuple, Union
-from urllib.parse import urljoin
+from time import monotonic
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple, Union
 
 from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from . import models
-from ._const import DEFAULT_USER_AGENT, TESTPAD_API
-from ._utils import parse_folder_contents
-from .exceptions import (
-    ActionNotAllowed,
-    APIServerError,
-    BadRequest,
-    IncorrectMethod,
-    NotFound,
-    RateLimitExceeded,
-    UnexpectedResponse,
+from ._const import TESTPAD_API
+from ._json import json_dumps, json_loads
+from ._utils import (
+    STATUS_NO_CONTENT,
+    STATUS_OK,
+    STATUS_OK_OR_CREATED,
+    STATUS_OK_OR_NOT_MODIFIED,
+    LRUCache,
+    check_response,
+    default_headers,
+    endpoint_url,
+    normalise_api_url,
+    parse_folder_contents,
 )
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 JsonSerializable = Union[Dict[str, Any], List[Any]]
 
+_TOO_MANY_REQUESTS = HTTPStatus.TOO_MANY_REQUESTS.value
+
+
+class _RateLimitRetry(Retry):
+    """
+    A retry policy which also retries POST requests, but only when they are rate limited
+    """
+
+    def is_retry(
+        self, method: str, status_code: int, has_retry_after: bool = False
+    ) -> bool:
+        # a 429 means the request was not processed, so unlike a gateway error it is safe to repeat
+        if status_code == _TOO_MANY_REQUESTS and method.upper() == "POST":
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+# Retry policy used unless a client is given its own: rate limited and temporarily unavailable
+# responses are retried with exponential backoff, waiting for as long as any Retry-After header
+# asks. POST is only retried when rate limited, as after a gateway error the request may have
+# been processed, and repeating it would create duplicates. Once retries run out the last
+# response is returned, so it is still raised as the matching exception (eg RateLimitExceeded).
+DEFAULT_RETRY = _RateLimitRetry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=(
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    ),
+    allowed_methods=frozenset(["GET", "PUT", "PATCH", "DELETE"]),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+_NOT_MODIFIED = HTTPStatus.NOT_MODIFIED.value
+
+# The number of responses kept when a client is created with cache_gets
+GET_CACHE_SIZE = 512
+# The default number of seconds a cached response is used for before it is checked again
+GET_CACHE_TTL = 30.0
+
+# Connection pool shared by every client created without an explicit session, so that
+# constructing many Testpad objects in one process reuses the same keep-alive connections
+_DEFAULT_ADAPTER: Optional[HTTPAdapter] = None
+
+
+def _make_adapter(retry: Union[Retry, int]) -> HTTPAdapter:
+    return HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=retry)
+
+
+def _default_adapter() -> HTTPAdapter:
+    global _DEFAULT_ADAPTER
+    if _DEFAULT_ADAPTER is None:
+        _DEFAULT_ADAPTER = _make_adapter(DEFAULT_RETRY)
+    return _DEFAULT_ADAPTER
+
+
+def _test_payload(
+    test_text: str, indent: int, tags: Optional[List[str]], notes: Optional[str]
+) -> Dict[str, Any]:
+    # convert into the format expected by the API, from the more user-friendly version here
+    tags = "" if tags is None else " ".join(tags)
+    return {"text": test_text, "indent": indent, "notes": notes, "tags": tags}
+
 
 class Testpad:
 
+    __slots__ = (
+        "_token",
+        "_base_url",
+        "_cache",
+        "_cache_ttl",
+        "_session",
+        "_do_request",
+    )
+
     def __init__(
         self,
         token: str,
         *,
         api_url: str = TESTPAD_API,
-        user_agent: str = DEFAULT_USER_AGENT,
+        user_agent: Optional[str] = None,
         session: Session = None,
+        retry: Union[Retry, int, None] = None,
+        cache_gets: bool = False,
+        cache_ttl: float = GET_CACHE_TTL,
     ):
         """
         Required parameters:
@@ -43,27 +132,49 @@ class Testpad:
         :param user_agent:
             Override the default user agent used to send in requests
         :param session:
-            Use this to override the default requests Session object
+            Use this to override the default requests Session object. By default, each client gets its
+            own Session but all of them share one connection pool, so that connections are kept alive
+            and reused across clients. Passing a session opts out of this, and of the default retry
+            policy - the session's own adapters are left in place unless `retry` is also given
+        :param retry:
+            Override the retry policy, which by default is DEFAULT_RETRY unless a session is passed, in
+            which case there is no retry policy by default. This takes a urllib3 Retry object, or a number
+            of retries for connection errors only - use 0 to disable retrying. The client then gets its
+            own connection pool with this policy, mounted on the session
+        :param cache_gets:
+            Keep the most recently fetched projects, folders, scripts and tests, and the whoami details,
+            in memory and return those again rather than fetching them from the API. The whole cache is
+            cleared whenever this client changes anything, but changes made elsewhere will not be seen
+            until an entry expires - only use this when the same items are fetched repeatedly
+        :param cache_ttl:
+            The number of seconds a cached response is used for. After that it is fetched again, or if
+            the API gave it an ETag, checked with a conditional request which needs no body in reply
+            if it has not changed
         """
         self._token = token
-
-        if api_url is None:
-            api_url = TESTPAD_API
-        if not api_url.endswith("/"):
-            api_url += "/"
-        self._base_url = api_url
-
-        self._session = session or Session()
+        self._base_url = normalise_api_url(api_url)
+
+        self._cache = LRUCache(GET_CACHE_SIZE) if cache_gets else None
+        self._cache_ttl = cache_ttl
+
+        adapter = None
+        if retry is not None:
+            adapter = _make_adapter(retry)
+        if session is None:
+            # a Session per client keeps headers and cookies separate, while the
+            # mounted adapter shares the underlying connections
+            session = Session()
+            if adapter is None:
+                adapter = _default_adapter()
+        if adapter is not None:
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self._session = session
+        # bound once here, as it is looked up on every request
+        self._do_request = session.request
 
         # set default headers including auth
-        self._session.headers.update(
-            {
-                "User-Agent": user_agent,
-                "Authorization": f"apikey {self._token}",
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-            }
-        )
+        self._session.headers.update(default_headers(token, user_agent))
 
     # ---
     # HTTP utility methods
@@ -73,64 +184,106 @@ class Testpad:
         self,
         method: str,
         path: str,
-        *accepted_responses: HTTPStatus,
+        accepted_responses: FrozenSet[int],
+        *,
         data: Optional[JsonSerializable] = None,
         query_params: Optional[Dict[str, str]] = None,
         **session_kwargs,
     ) -> Response:
-        url = urljoin(self._base_url, path)
-        resp = self._session.request(
-            str(method), url, params=query_params, json=data, **session_kwargs
+        if self._cache is not None and method != "GET":
+            # anything cached may be affected by a change, so start again
+            self._cache.clear()
+
+        url = endpoint_url(self._base_url, path)
+        resp = self._do_request(
+            str(method),
+            url,
+            params=query_params,
+            data=None if data is None else json_dumps(data),
+            # the API does not redirect, so a 3xx is raised as UnexpectedResponse rather than followed
+            allow_redirects=False,
+            **session_kwargs,
         )
+        check_response(resp, accepted_responses)
+        return resp
 
-        if resp.status_code in accepted_responses:
-            return resp
-
-        if resp.status_code in (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN):
-            raise ActionNotAllowed(resp)
-
-        if resp.status_code == HTTPStatus.BAD_REQUEST:
-            raise BadRequest(resp)
-
-        if resp.status_code == HTTPStatus.NOT_FOUND:
-            raise NotFound(resp)
-
-        if resp.status_code == HTTPStatus.METHOD_NOT_ALLOWED:
-            raise IncorrectMethod(resp)
-
-        if resp.status_code == HTTPStatus.TOO_MANY_REQUESTS:
-            raise RateLimitExceeded(resp)
-
-        if resp.status_code == HTTPStatus.INTERNAL_SERVER_ERROR:
-            raise APIServerError(resp)
+    def _get(
+        self, path: str, params: Dict[str, str] = None, *, cache: bool = False
+    ) -> Dict[str, Any]:
+        """
+        :param cache:
+            Whether this response can be cached, if the client was created with cache_gets. The raw body
+            is cached and decoded again on each use, so callers never share (and so cannot change) the
+            data held in the cache.
+        """
+        cache = cache and self._cache is not None
+        entry = None
+        if cache:
+            key = (path, tuple(sorted(params.items())) if params else None)
+            # entries are (expiry time, ETag or None, response body)
+            entry = self._cache.get(key)
+            if entry is not None and monotonic() < entry[0]:
+                return json_loads(entry[2])
+
+        if entry is not None and entry[1] is not None:
+            # revalidate the expired entry, which the API answers with 304 if it is unchanged
+            resp = self._request(
+                "GET",
+                path,
+                STATUS_OK_OR_NOT_MODIFIED,
+                query_params=params,
+                headers={"If-None-Match": entry[1]},
+            )
+        else:
+            resp = self._request("GET", path, STATUS_OK, query_params=params)
 
-        raise UnexpectedResponse(resp)
+        if resp.status_code == _NOT_MODIFIED:
+            content = entry[2]
+        else:
+            content = resp.content
+            entry = None
 
-    def _get(self, path: str, params: Dict[str, str] = None) -> Dict[str, Any]:
-        return self._request("GET", path, HTTPStatus.OK, query_params=params).json()
+        if cache:
+            # a 304 may not repeat the ETag, in which case the one already held is still valid
+            etag = resp.headers.get("ETag", entry[1] if entry is not None else None)
+            self._cache.set(key, (monotonic() + self._cache_ttl, etag, content))
+        return json_loads(content)
 
     def _put(self, path: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        return self._request(
-            "PUT", path, HTTPStatus.CREATED, HTTPStatus.OK, data=data
-        ).json()
+        resp = self._request("PUT", path, STATUS_OK_OR_CREATED, data=data)
+        return json_loads(resp.content)
 
     def _post(
         self, path: str, data: JsonSerializable, *, params: dict[str, str] = None
     ) -> Dict[str, Any]:
-        return self._request(
+        resp = self._request(
             "POST",
             path,
-            HTTPStatus.OK,
-            HTTPStatus.CREATED,
+            STATUS_OK_OR_CREATED,
             query_params=params,
             data=data,
-        ).json()
+        )
+        return json_loads(resp.content)
 
     def _patch(self, path: str, data: Dict[str, str]) -> Dict[str, Any]:
-        return self._request("PATCH", path, HTTPStatus.OK, data=data).json()
+        resp = self._request("PATCH", path, STATUS_OK, data=data)
+        return json_loads(resp.content)
 
     def _delete(self, path: str) -> Response:
-        return self._request("DELETE", path, HTTPStatus.NO_CONTENT)
+        return self._request("DELETE", path, STATUS_NO_CONTENT)
+
+    def _iter_get(self, path: str, key: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yields each item of the list under `key` in the response, parsing the body incrementally as it
+        arrives if ijson is installed, or from the fully read response if not.
+        """
+        if ijson is None:
+            yield from self._get(path)[key]
+            return
+        with self._request("GET", path, STATUS_OK, stream=True) as resp:
+            # make sure any gzip transfer encoding is undone before the bytes reach the parser
+            resp.raw.decode_content = True
+            yield from ijson.items(resp.raw, f"{key}.item", use_float=True)
 
     # ---
     # Utilities
@@ -144,7 +297,7 @@ class Testpad:
             An object containing the information of the company owning the API key, and information
             about the API key making the request.
         """
-        data = self._get("whoami")
+        data = self._get("whoami", cache=True)
         company = models.Company(**data["company"])
         key = models.ApiKey(**data["apikey"])
         return company, key
@@ -154,13 +307,13 @@ class Testpad:
     # ---
 
     def get_project(self, project_id: int) -> models.Project:
-        data = self._get(f"projects/{project_id}")
+        data = self._get(f"projects/{project_id}", cache=True)
         proj = data["project"]
-        return models.Project(**proj)
+        return models.Project.from_api(proj)
 
     def list_projects(self) -> List[models.Project]:
         data = self._get("projects")
-        return [models.Project(**proj) for proj in data["projects"]]
+        return list(map(models.Project.from_api, data["projects"]))
 
     def get_project_contents(
         self, project_id: int
@@ -171,10 +324,27 @@ class Testpad:
         :return:
             The list of contents of the project
         """
-        data = self._get(f"projects/{project_id}/folders")
-        if len(data["folders"]) > 0:
-            return [parse_folder_contents(obj) for obj in data["folders"]]
-        return []
+        return list(self.iter_project_contents(project_id))
+
+    def iter_project_contents(
+        self, project_id: int
+    ) -> Iterator[Union[models.Folder, models.Script, models.Note]]:
+        """
+        Yields the top level items of a project one by one, as the response is received - each folder
+        is yielded complete with its contents. This keeps memory use lower for large projects, and lets
+        the caller stop early, for example once a particular script has been found.
+
+        As with `iter_tests`, incremental parsing needs the optional ``ijson`` package.
+
+        :param project_id:
+            The project to get the contents of
+        :return:
+            An iterator of the contents of the project, in order
+        """
+        yield from map(
+            parse_folder_contents,
+            self._iter_get(f"projects/{project_id}/folders", "folders"),
+        )
 
     # ---
     # Project notes
@@ -182,11 +352,11 @@ class Testpad:
 
     def list_project_notes(self, project_id: int) -> List[models.Note]:
         data = self._get(f"projects/{project_id}/notes")
-        return [models.Note(**note) for note in data["notes"]]
+        return list(map(models.Note.from_api, data["notes"]))
 
     def add_project_note(self, project_id: int, name: str) -> models.Note:
         data = self._post(f"projects/{project_id}/notes", {"name": name})
-        return models.Note(**data)
+        return models.Note.from_api(data)
 
     def update_project_note(
         self, project_id: int, note_id: str, name: str
@@ -204,7 +374,35 @@ class Testpad:
             An updated Note object with the new contents
         """
         data = self._patch(f"projects/{project_id}/notes/{note_id}", {"name": name})
-        return models.Note(**data)
+        return models.Note.from_api(data)
+
+    def bulk_update_project_notes(
+        self, project_id: int, updates: Dict[str, str], max_workers: int = 16
+    ) -> List[models.Note]:
+        """
+        Replaces the text of several project notes, sending the updates in parallel from a pool of threads
+        rather than one after another.
+
+        The updates are not applied all together - if any of them fails, the exception for the first
+        failure in the order given is raised once the rest have finished, and the other notes may
+        already have been updated.
+
+        :param project_id:
+            Which project the notes belong to
+        :param updates:
+            The new contents of each note, keyed by note ID
+        :param max_workers:
+            The most updates to have in progress at once
+        :return:
+            The updated Note objects, in the same order as the updates given
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(
+                    lambda update: self.update_project_note(project_id, *update),
+                    updates.items(),
+                )
+            )
 
     # def delete_project_note(self, project_id: int, note_id: str):
     #     self._delete(f"projects/{project_id}/notes/{note_id}")
@@ -219,7 +417,7 @@ class Testpad:
         url = f"projects/{project_id}/folders/{folder_id}"
         if not subfolders:
             url = f"{url}?subfolders=none"
-        data = self._get(url)
+        data = self._get(url, cache=True)
         return parse_folder_contents(data["folder"])
 
     def rename_folder(
@@ -263,7 +461,7 @@ class Testpad:
 
     def list_folder_notes(self, project_id: int, folder_id: str) -> List[models.Note]:
         data = self._get(f"projects/{project_id}/folders/{folder_id}/notes")
-        return [models.Note(**note) for note in data["notes"]]
+        return list(map(models.Note.from_api, data["notes"]))
 
     def add_folder_note(
         self, project_id: int, folder_id: str, name: str
@@ -271,7 +469,7 @@ class Testpad:
         data = self._post(
             f"projects/{project_id}/folders/{folder_id}/notes", {"name": name}
         )
-        return models.Note(**data)
+        return models.Note.from_api(data)
 
     def update_folder_note(
         self, project_id: int, folder_id: str, note_id: str, name: str
@@ -279,7 +477,7 @@ class Testpad:
         data = self._patch(
             f"projects/{project_id}/folders/{folder_id}/notes/{note_id}", {"name": name}
         )
-        return models.Note(**data)
+        return models.Note.from_api(data)
 
     # ---
     # Scripts
@@ -327,7 +525,7 @@ class Testpad:
         return parse_folder_contents(data["script"])
 
     def get_script(self, script_id: int) -> models.Script:
-        data = self._get(f"scripts/{script_id}")
+        data = self._get(f"scripts/{script_id}", cache=True)
         return models.Script(**data["script"])
 
     def update_script(
@@ -384,17 +582,39 @@ class Testpad:
         :return:
             An object containing the full details of the created test
         """
-        # convert into the format expected by the API, from the more user-friendly version here
-        tags = "" if tags is None else " ".join(tags)
-        data = self._post(
-            f"scripts/{script_id}/tests",
-            data=[{"text": test_text, "indent": indent, "notes": notes, "tags": tags}],
-        )
-        return models.Test(**data["tests"][0])
+        return self._append_tests(
+            script_id, [_test_payload(test_text, indent, tags, notes)]
+        )[0]
+
+    def append_tests(self, script_id: int) -> "TestBatch":
+        """
+        Appends several tests to the end of an existing script in a single request. Use the returned
+        batch as a context manager, adding tests with its `append` method - they are sent when the
+        `with` block exits, and the created tests are then available as the batch's `tests`:
+
+            with client.append_tests(script_id) as batch:
+                batch.append("First test")
+                batch.append("A step of the first test", indent=1)
+            print(batch.tests)
+
+        If the `with` block raises an exception, nothing is sent.
+
+        :param script_id:
+            The ID of the script to append the tests to
+        :return:
+            A batch to add the tests to
+        """
+        return TestBatch(self, script_id)
+
+    def _append_tests(
+        self, script_id: int, tests: List[Dict[str, Any]]
+    ) -> List[models.Test]:
+        data = self._post(f"scripts/{script_id}/tests", data=tests)
+        return list(map(models.Test.from_api, data["tests"]))
 
     def get_test(self, script_id: int, test_id: int) -> models.Test:
-        data = self._get(f"scripts/{script_id}/tests/{test_id}")
-        return models.Test(**data["test"])
+        data = self._get(f"scripts/{script_id}/tests/{test_id}", cache=True)
+        return models.Test.from_api(data["test"])
 
     def update_test(
         self,
@@ -408,11 +628,27 @@ class Testpad:
     ) -> models.Test:
         new_data = {"text": test_text, "indent": indent, "tags": tags, "notes": notes}
         data = self._patch(f"scripts/{script_id}/tests/{test_id}", data=new_data)
-        return models.Test(**data["test"])
+        return models.Test.from_api(data["test"])
+
+    def iter_tests(self, script_id: int) -> Iterator[models.Test]:
+        """
+        Yields the tests in a script one by one, as the response is received. This keeps memory use low
+        for scripts with many tests, and lets the caller stop early without building the rest.
+
+        Incremental parsing needs the optional ``ijson`` package, installed with
+        ``pip install testpad-python[streaming]`` - without it, the whole response is read first.
+
+        :param script_id:
+            The ID of the script to list the tests of
+        :return:
+            An iterator of the tests in the script, in order
+        """
+        yield from map(
+            models.Test.from_api, self._iter_get(f"scripts/{script_id}/tests", "tests")
+        )
 
     def list_tests(self, script_id: int) -> List[models.Test]:
-        data = self._get(f"scripts/{script_id}/tests")
-        return [models.Test(**test) for test in data["tests"]]
+        return list(self.iter_tests(script_id))
 
     # def delete_test(self, script_id: int, test_id: int):
     #     self._delete(f"scripts/{script_id}/tests/{test_id}")
@@ -449,6 +685,13 @@ class Testpad:
         results: dict[str, models.TestResult] = None,
         retest_id: int = None,
     ) -> models.Run:
+        if results is not None:
+            # convert TestResult objects here rather than leaving it to the JSON encoder, as the
+            # standard library json module cannot encode dataclasses while orjson can
+            results = {
+                key: (value.to_api() if isinstance(value, models.TestResult) else value)
+                for key, value in results.items()
+            }
         payload = {
             "headers": headers,
             "results": results,
@@ -456,3 +699,49 @@ class Testpad:
         params = {"retest": retest_id} if retest_id is not None else None
         data = self._post(f"scripts/{script_id}/runs", data=payload, params=params)
         return models.Run(**data["run"])
+
+
+class TestBatch:
+    """
+    Tests to be appended to a script in one request, created by `Testpad.append_tests`
+    """
+
+    def __init__(self, client: Testpad, script_id: int):
+        self._client = client
+        self._script_id = script_id
+        self._pending: List[Dict[str, Any]] = []
+        self.tests: List[models.Test] = []
+        """ The tests created, once the batch has been sent """
+
+    def __enter__(self) -> "TestBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.send()
+
+    def append(
+        self,
+        test_text: str,
+        indent: int = 0,
+        tags: List[str] = None,
+        notes: str = None,
+    ):
+        """
+        Adds a test to the batch, taking the same arguments as `Testpad.append_test`
+        """
+        self._pending.append(_test_payload(test_text, indent, tags, notes))
+
+    def send(self) -> List[models.Test]:
+        """
+        Sends the tests added so far, if any. This is called automatically at the end of a `with` block.
+
+        :return:
+            The tests created by this call
+        """
+        if not self._pending:
+            return []
+        created = self._client._append_tests(self._script_id, self._pending)
+        self._pending = []
+        self.tests.extend(created)
+        return created
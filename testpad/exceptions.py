@@ -1,27 +1,48 @@
+from typing import Any, Dict, Optional
+
 from requests import Response
 
+from ._json import json_loads
+
+
+def parse_error_body(response: Response) -> Dict[str, Any]:
+    """
+    Returns the JSON object in an error response, or an empty dict if there isn't one
+    """
+    try:
+        body = json_loads(response.content) if response.content else {}
+    except ValueError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
 
 class TestpadClientException(Exception):
 
-    def __init__(self, response: Response, message: str):
+    def __init__(
+        self, response: Response, message: str, body: Optional[Dict[str, Any]] = None
+    ):
         self.response = response
+        self.body = body
+        """ The parsed JSON body of the response, so it does not need decoding again """
         super().__init__(message)
 
 
 class UnexpectedResponse(TestpadClientException):
 
-    def __init__(self, response: Response):
+    def __init__(self, response: Response, body: Optional[Dict[str, Any]] = None):
         message = f"Unexpected response from request to {response.url} - status {response.status_code}"
-        super().__init__(response, message)
+        super().__init__(response, message, body)
 
 
 class ActionNotAllowed(TestpadClientException):
 
-    def __init__(self, response: Response):
+    def __init__(self, response: Response, body: Optional[Dict[str, Any]] = None):
         self.response = response
-        reason = response.json().get("error", "Unknown")
+        if body is None:
+            body = parse_error_body(response)
+        reason = body.get("error", "Unknown")
         msg = f"Authorization not accepted: {reason}"
-        super().__init__(response, msg)
+        super().__init__(response, msg, body)
 
 
 class BadRequest(TestpadClientException):
@@ -29,11 +50,11 @@ class BadRequest(TestpadClientException):
     Raised if the client encounters an Http 400 Bad Request response
     """
 
-    def __init__(self, response: Response):
-        message = response.json().get(
-            "error", "Reason unknown, inspect the Response object"
-        )
-        super().__init__(response, message)
+    def __init__(self, response: Response, body: Optional[Dict[str, Any]] = None):
+        if body is None:
+            body = parse_error_body(response)
+        message = body.get("error", "Reason unknown, inspect the Response object")
+        super().__init__(response, message, body)
 
 
 class IncorrectMethod(TestpadClientException):
@@ -41,21 +62,23 @@ class IncorrectMethod(TestpadClientException):
     Raised if an incorrect HTTP method is used for an endpoint (eg, PUT instead of POST)
     """
 
-    def __init__(self, response: Response):
-        message = response.json().get("detail", "Unknown")
-        super().__init__(response, message)
+    def __init__(self, response: Response, body: Optional[Dict[str, Any]] = None):
+        if body is None:
+            body = parse_error_body(response)
+        message = body.get("detail", "Unknown")
+        super().__init__(response, message, body)
 
 
 class NotFound(TestpadClientException):
 
-    def __init__(self, response: Response):
+    def __init__(self, response: Response, body: Optional[Dict[str, Any]] = None):
         self.response = response
         message = f"Entity not found at {response.url}"
-        super().__init__(response, message)
+        super().__init__(response, message, body)
 
 
 class RateLimitExceeded(TestpadClientException):
-    def __init__(self, response: Response):
+    def __init__(self, response: Response, body: Optional[Dict[str, Any]] = None):
         self.response = response
         retry_after = response.headers.get("Retry-After", "Unknown")
         try:
@@ -63,11 +86,11 @@ class RateLimitExceeded(TestpadClientException):
         except ValueError:
             self.retry_after = retry_after
         message = f"Rate limit exceeded - retry in {self.retry_after} seconds"
-        super().__init__(response, message)
+        super().__init__(response, message, body)
 
 
 class APIServerError(TestpadClientException):
-    def __init__(self, response: Response):
+    def __init__(self, response: Response, body: Optional[Dict[str, Any]] = None):
         self.response = response
         message = "The Testpad server had an internal error"
-        super().__init__(response, message)
+        super().__init__(response, message, body)
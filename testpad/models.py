@@ -1,36 +1,82 @@
+import re
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Union
 
+# Slots make model instances smaller and faster to read from, but dataclasses only
+# support them from Python 3.10 - on 3.9 the models are plain dataclasses.
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+# the fraction of a second in a timestamp, which always follows the seconds
+_FRACTION = re.compile(r"(?<=:\d\d)\.(\d+)")
+
+
+def _six_digit_fraction(match: "re.Match[str]") -> str:
+    # datetimes only hold microseconds, so any further digits are dropped
+    return "." + match.group(1)[:6].ljust(6, "0")
+
+
+def _parse_datetime(value: Any) -> Any:
+    """
+    Converts an ISO 8601 timestamp from the API into a datetime. Anything else, including values
+    which are already datetimes and strings in an unexpected format, is returned unchanged.
+    """
+    if not isinstance(value, str):
+        return value
+    # fromisoformat only accepts a "Z" suffix, and fractions of a second other than 3 or 6 digits,
+    # from Python 3.11
+    timestamp = value[:-1] + "+00:00" if value.endswith("Z") else value
+    timestamp = _FRACTION.sub(_six_digit_fraction, timestamp, count=1)
+    try:
+        return datetime.fromisoformat(timestamp)
+    except ValueError:
+        return value
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Company:
     name: str
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ApiKey:
     number: int
     label: str = Optional[str]
     expires: Optional[datetime] = None
 
+    def __post_init__(self):
+        self.expires = _parse_datetime(self.expires)
+
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Project:
     id: int
     name: str
     description: str
     created: datetime
 
+    def __post_init__(self):
+        self.created = _parse_datetime(self.created)
+
+    @classmethod
+    def from_api(cls, data: dict):
+        return cls(data["id"], data["name"], data["description"], data["created"])
+
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Note:
     type: str  # will always be 'note'
     id: str
     name: str
 
+    @classmethod
+    def from_api(cls, data: dict):
+        return cls(data["type"], data["id"], data["name"])
+
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Test:
     id: int
     text: str
@@ -41,8 +87,19 @@ class Test:
     # Script ID is not returned from some endpoints
     script_id: int = None
 
+    @classmethod
+    def from_api(cls, data: dict):
+        return cls(
+            data["id"],
+            data["text"],
+            data["indent"],
+            data.get("tags"),
+            data.get("notes"),
+            data.get("script_id"),
+        )
+
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class TestResult:
     result: str
     passed: bool = None
@@ -52,8 +109,22 @@ class TestResult:
     def __post_init__(self):
         self.passed = self.result == "pass"
 
+    @classmethod
+    def from_api(cls, data: dict):
+        # passed is always derived from the result, in __post_init__
+        return cls(data["result"], None, data.get("comment"), data.get("issue"))
+
+    def to_api(self) -> Dict[str, str]:
+        # passed is left out, as the API derives it from the result too
+        data = {"result": self.result}
+        if self.comment is not None:
+            data["comment"] = self.comment
+        if self.issue is not None:
+            data["issue"] = self.issue
+        return data
+
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Progress:
     total: int
     fail: int
@@ -65,10 +136,11 @@ class Progress:
 
     @classmethod
     def from_api(cls, data: dict):
+        data = dict(data)
         return cls(passed=data.pop("pass", 0), **data)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Run:
     id: int
 
@@ -101,10 +173,11 @@ class Run:
     assignee: str = None
 
     def __post_init__(self):
-        self.results = {key: TestResult(**value) for key, value in self.results.items()}
+        from_api = TestResult.from_api
+        self.results = {key: from_api(value) for key, value in self.results.items()}
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Script:
     type: str  # will always be 'script'
     id: int
@@ -126,15 +199,16 @@ class Script:
     """ Runs are included in script endpoints by default, and folder endpoints when requested """
 
     def __post_init__(self):
+        self.created = _parse_datetime(self.created)
         if self.tests is not None:
-            self.tests = [Test(**t) for t in self.tests]
+            self.tests = list(map(Test.from_api, self.tests))
         if self.runs is not None:
             self.runs = [Run(**r) for r in self.runs]
         if self.progress is not None:
             self.progress = Progress.from_api(self.progress)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Folder:
     type: str  # will always be 'folder'
     id: str
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from testpad import models
+
+from .testutils import make_client
+
+
+def _create_tests(request):
+    # echo the tests back as the API would, giving each one an ID
+    tests = [
+        {"id": i, "text": test["text"], "indent": test["indent"]}
+        for i, test in enumerate(json.loads(request.body), start=1)
+    ]
+    return 201, {"tests": tests}, {}
+
+
+def test_batch_is_sent_in_one_request():
+    client, adapter = make_client(_create_tests)
+
+    with client.append_tests(8) as batch:
+        batch.append("First test")
+        batch.append("A step", indent=1, tags=["smoke", "ui"], notes="Check this")
+
+    (request,) = adapter.requests
+    assert request.method == "POST"
+    assert request.url == "https://testpad.example/api/v1/scripts/8/tests"
+    assert json.loads(request.body) == [
+        {"text": "First test", "indent": 0, "notes": None, "tags": ""},
+        {"text": "A step", "indent": 1, "notes": "Check this", "tags": "smoke ui"},
+    ]
+    assert batch.tests == [
+        models.Test(1, "First test", 0),
+        models.Test(2, "A step", 1),
+    ]
+
+
+def test_nothing_is_sent_if_the_block_raises():
+    client, adapter = make_client(_create_tests)
+
+    with pytest.raises(RuntimeError):
+        with client.append_tests(8) as batch:
+            batch.append("First test")
+            raise RuntimeError()
+
+    assert adapter.requests == []
+    assert batch.tests == []
+
+
+def test_empty_batch_sends_nothing():
+    client, adapter = make_client(_create_tests)
+
+    with client.append_tests(8):
+        pass
+
+    assert adapter.requests == []
+
+
+def test_send_twice_only_sends_once():
+    client, adapter = make_client(_create_tests)
+    batch = client.append_tests(8)
+    batch.append("First test")
+
+    assert batch.send() == [models.Test(1, "First test", 0)]
+    assert batch.send() == []
+    assert len(adapter.requests) == 1
+    assert batch.tests == [models.Test(1, "First test", 0)]
+
+
+def test_append_test_returns_a_single_test():
+    client, adapter = make_client(_create_tests)
+
+    test = client.append_test(8, "Only test", tags=["smoke"])
+
+    assert test == models.Test(1, "Only test", 0)
+    assert json.loads(adapter.requests[0].body) == [
+        {"text": "Only test", "indent": 0, "notes": None, "tags": "smoke"}
+    ]
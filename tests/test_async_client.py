@@ -0,0 +1,179 @@
+import asyncio
+import json
+
+import pytest
+
+from testpad import exceptions, models
+
+# the async client needs the optional httpx dependency
+httpx = pytest.importorskip("httpx")
+
+from testpad.async_client import AsyncTestpad  # noqa: E402
+
+
+def _project(project_id):
+    return {
+        "id": project_id,
+        "name": f"Project {project_id}",
+        "description": "",
+        "created": "2024-01-02T03:04:05Z",
+    }
+
+
+def _client(handler, **kwargs) -> AsyncTestpad:
+    transport = httpx.MockTransport(handler)
+    return AsyncTestpad(
+        "token",
+        api_url="https://testpad.example/api/v1",
+        client=httpx.AsyncClient(transport=transport),
+        **kwargs,
+    )
+
+
+def _run(client: AsyncTestpad, coro_fn):
+    async def main():
+        async with client:
+            return await coro_fn(client)
+
+    return asyncio.run(main())
+
+
+def test_headers_and_url():
+    requests = []
+
+    def handler(request: httpx.Request):
+        requests.append(request)
+        return httpx.Response(200, json={"project": _project(1)})
+
+    client = _client(handler, user_agent="test-agent")
+    project = _run(client, lambda c: c.get_project(1))
+
+    assert project == models.Project.from_api(_project(1))
+    (request,) = requests
+    assert str(request.url) == "https://testpad.example/api/v1/projects/1"
+    assert request.headers["Authorization"] == "apikey token"
+    assert request.headers["User-Agent"] == "test-agent"
+    assert request.headers["Accept"] == "application/json"
+
+
+def test_gather_keeps_order_and_limits_concurrency():
+    in_flight = 0
+    most_in_flight = 0
+
+    async def handler(request: httpx.Request):
+        nonlocal in_flight, most_in_flight
+        in_flight += 1
+        most_in_flight = max(most_in_flight, in_flight)
+        project_id = int(request.url.path.rsplit("/", 1)[1])
+        # later IDs finish first, so results arrive out of order
+        await asyncio.sleep(0.01 * (10 - project_id))
+        in_flight -= 1
+        return httpx.Response(200, json={"project": _project(project_id)})
+
+    client = _client(handler, max_concurrency=3)
+    projects = _run(client, lambda c: c.get_projects(range(1, 9)))
+
+    assert [p.id for p in projects] == list(range(1, 9))
+    assert most_in_flight == 3
+
+
+@pytest.mark.parametrize(
+    "status, body, headers, exception, message",
+    [
+        (400, {"error": "Bad text"}, {}, exceptions.BadRequest, "Bad text"),
+        (
+            401,
+            {"error": "Bad key"},
+            {},
+            exceptions.ActionNotAllowed,
+            "Authorization not accepted: Bad key",
+        ),
+        (
+            404,
+            {},
+            {},
+            exceptions.NotFound,
+            "Entity not found at https://testpad.example/api/v1/scripts/5",
+        ),
+        (
+            429,
+            {},
+            {"Retry-After": "7"},
+            exceptions.RateLimitExceeded,
+            "Rate limit exceeded - retry in 7 seconds",
+        ),
+        (
+            418,
+            {},
+            {},
+            exceptions.UnexpectedResponse,
+            "Unexpected response from request to "
+            "https://testpad.example/api/v1/scripts/5 - status 418",
+        ),
+    ],
+)
+def test_error_statuses_raise(status, body, headers, exception, message):
+    def handler(request: httpx.Request):
+        return httpx.Response(status, content=json.dumps(body), headers=headers)
+
+    client = _client(handler)
+    with pytest.raises(exception) as exc_info:
+        _run(client, lambda c: c.get_script(5))
+
+    assert type(exc_info.value) is exception
+    assert str(exc_info.value) == message
+    assert exc_info.value.body == body
+
+
+def _contents(project_id):
+    return [{"type": "note", "id": f"n{project_id}", "name": f"Note {project_id}"}]
+
+
+def _projects_handler(requests):
+    def handler(request: httpx.Request):
+        requests.append(request.url.path)
+        parts = request.url.path.split("/")[3:]
+        if parts == ["projects"]:
+            return httpx.Response(200, json={"projects": [_project(2), _project(1)]})
+        project_id = int(parts[1])
+        if parts[2:] == ["folders"]:
+            return httpx.Response(200, json={"folders": _contents(project_id)})
+        return httpx.Response(200, json={"project": _project(project_id)})
+
+    return handler
+
+
+def _details(project_id):
+    return (
+        models.Project.from_api(_project(project_id)),
+        [models.Note("note", f"n{project_id}", f"Note {project_id}")],
+    )
+
+
+def test_list_project_details_for_all_projects():
+    requests = []
+    client = _client(_projects_handler(requests))
+
+    details = _run(client, lambda c: c.list_project_details())
+
+    assert details == [_details(2), _details(1)]
+    assert sorted(requests) == [
+        "/api/v1/projects",
+        "/api/v1/projects/1/folders",
+        "/api/v1/projects/2/folders",
+    ]
+
+
+def test_list_project_details_for_given_projects():
+    requests = []
+    client = _client(_projects_handler(requests))
+
+    details = _run(client, lambda c: c.list_project_details([3, 1]))
+
+    assert details == [_details(3), _details(1)]
+    assert sorted(requests) == [
+        "/api/v1/projects/1",
+        "/api/v1/projects/1/folders",
+        "/api/v1/projects/3",
+        "/api/v1/projects/3/folders",
+    ]
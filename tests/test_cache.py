@@ -0,0 +1,196 @@
+import pytest
+
+from testpad import client as client_module
+from testpad import models
+
+from .testutils import make_client
+
+TEST = {"test": {"id": 1, "text": "A test", "indent": 0, "tags": ["a"]}}
+NOTE = {"type": "note", "id": "n1", "name": "Changed"}
+
+
+def _handler(request):
+    if request.method == "PATCH":
+        return 200, NOTE, {}
+    return 200, TEST, {}
+
+
+def _gets(adapter):
+    return [request.url for request in adapter.requests if request.method == "GET"]
+
+
+def test_hit_skips_the_network():
+    client, adapter = make_client(_handler, cache_gets=True)
+
+    first = client.get_test(9, 1)
+    second = client.get_test(9, 1)
+
+    assert first == second == models.Test(1, "A test", 0, ["a"])
+    assert len(adapter.requests) == 1
+
+
+def test_not_cached_by_default():
+    client, adapter = make_client(_handler)
+
+    client.get_test(9, 1)
+    client.get_test(9, 1)
+
+    assert len(adapter.requests) == 2
+
+
+def test_changing_a_returned_model_does_not_change_the_cache():
+    client, _ = make_client(_handler, cache_gets=True)
+
+    test = client.get_test(9, 1)
+    test.tags.append("MUTATED")
+
+    assert client.get_test(9, 1).tags == ["a"]
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    monkeypatch.setattr(client_module, "GET_CACHE_SIZE", 2)
+    client, adapter = make_client(_handler, cache_gets=True)
+
+    client.get_test(9, 1)
+    client.get_test(9, 2)
+    # using test 1 again makes test 2 the least recently used
+    client.get_test(9, 1)
+    client.get_test(9, 3)
+    client.get_test(9, 1)
+    client.get_test(9, 2)
+
+    assert [url.rsplit("/", 1)[1] for url in _gets(adapter)] == ["1", "2", "3", "2"]
+
+
+def test_cleared_after_a_change():
+    client, adapter = make_client(_handler, cache_gets=True)
+
+    client.get_test(9, 1)
+    client.update_project_note(4, "n1", "Changed")
+    client.get_test(9, 1)
+
+    assert len(_gets(adapter)) == 2
+
+
+@pytest.mark.parametrize(
+    "params, same",
+    [
+        ({"a": "1", "b": "2"}, True),
+        ({"b": "2", "a": "1"}, True),
+        ({"a": "1"}, False),
+        (None, False),
+    ],
+)
+def test_query_params_are_part_of_the_key(params, same):
+    client, adapter = make_client(_handler, cache_gets=True)
+
+    client._get("scripts/9/tests/1", {"a": "1", "b": "2"}, cache=True)
+    client._get("scripts/9/tests/1", params, cache=True)
+
+    assert len(adapter.requests) == (1 if same else 2)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(client_module, "monotonic", clock)
+    return clock
+
+
+def _queue(*responses):
+    """
+    Returns a handler which gives each of the responses in turn, as (status, text of test, headers)
+    """
+    responses = list(responses)
+
+    def handler(request):
+        status, text, headers = responses.pop(0)
+        body = None if text is None else {"test": {"id": 1, "text": text, "indent": 0}}
+        return status, body, headers
+
+    return handler
+
+
+def test_entry_expires_after_ttl(clock):
+    client, adapter = make_client(
+        _queue((200, "Old", {}), (200, "New", {})), cache_gets=True, cache_ttl=10
+    )
+
+    assert client.get_test(9, 1).text == "Old"
+    clock.now += 9.9
+    assert client.get_test(9, 1).text == "Old"
+    clock.now += 0.1
+    assert client.get_test(9, 1).text == "New"
+
+    assert len(adapter.requests) == 2
+    # there was no ETag to revalidate with
+    assert "If-None-Match" not in adapter.requests[1].headers
+
+
+def test_expired_entry_is_revalidated_with_its_etag(clock):
+    client, adapter = make_client(
+        _queue((200, "Old", {"ETag": '"v1"'}), (304, None, {"ETag": '"v1"'})),
+        cache_gets=True,
+    )
+
+    client.get_test(9, 1)
+    clock.now += client_module.GET_CACHE_TTL
+
+    assert client.get_test(9, 1).text == "Old"
+    assert "If-None-Match" not in adapter.requests[0].headers
+    assert adapter.requests[1].headers["If-None-Match"] == '"v1"'
+
+
+def test_not_modified_refreshes_expiry_and_keeps_etag(clock):
+    client, adapter = make_client(
+        _queue(
+            (200, "Old", {"ETag": '"v1"'}),
+            (304, None, {}),
+            (304, None, {}),
+        ),
+        cache_gets=True,
+        cache_ttl=10,
+    )
+
+    client.get_test(9, 1)
+    clock.now += 10
+    assert client.get_test(9, 1).text == "Old"
+    # the 304 started the TTL again
+    clock.now += 9
+    assert client.get_test(9, 1).text == "Old"
+    assert len(adapter.requests) == 2
+
+    clock.now += 1
+    assert client.get_test(9, 1).text == "Old"
+    assert len(adapter.requests) == 3
+    # the 304s had no ETag, so the original one is still used
+    assert adapter.requests[2].headers["If-None-Match"] == '"v1"'
+
+
+def test_changed_response_replaces_entry(clock):
+    client, adapter = make_client(
+        _queue(
+            (200, "Old", {"ETag": '"v1"'}),
+            (200, "New", {"ETag": '"v2"'}),
+            (304, None, {}),
+        ),
+        cache_gets=True,
+        cache_ttl=10,
+    )
+
+    client.get_test(9, 1)
+    clock.now += 10
+    assert client.get_test(9, 1).text == "New"
+    clock.now += 10
+    assert client.get_test(9, 1).text == "New"
+
+    assert adapter.requests[1].headers["If-None-Match"] == '"v1"'
+    assert adapter.requests[2].headers["If-None-Match"] == '"v2"'
@@ -0,0 +1,77 @@
+import pytest
+
+from testpad import exceptions
+
+from .testutils import make_client, respond
+
+HTML = b"<html><body><h1>401 Authorization Required</h1></body></html>"
+
+
+@pytest.mark.parametrize(
+    "status, body, exception, message, parsed",
+    [
+        (
+            400,
+            {"error": "Text is required"},
+            exceptions.BadRequest,
+            "Text is required",
+            {"error": "Text is required"},
+        ),
+        (
+            400,
+            None,
+            exceptions.BadRequest,
+            "Reason unknown, inspect the Response object",
+            {},
+        ),
+        (
+            401,
+            {"error": "Invalid API key"},
+            exceptions.ActionNotAllowed,
+            "Authorization not accepted: Invalid API key",
+            {"error": "Invalid API key"},
+        ),
+        (
+            401,
+            HTML,
+            exceptions.ActionNotAllowed,
+            "Authorization not accepted: Unknown",
+            {},
+        ),
+        (
+            405,
+            {"detail": "Method not allowed"},
+            exceptions.IncorrectMethod,
+            "Method not allowed",
+            {"detail": "Method not allowed"},
+        ),
+        (405, ["not", "an", "object"], exceptions.IncorrectMethod, "Unknown", {}),
+        (
+            500,
+            HTML,
+            exceptions.APIServerError,
+            "The Testpad server had an internal error",
+            {},
+        ),
+    ],
+)
+def test_error_body_is_parsed(status, body, exception, message, parsed):
+    client, _ = make_client(respond(body, status=status))
+
+    with pytest.raises(exception) as exc_info:
+        client.get_script(5)
+
+    assert type(exc_info.value) is exception
+    assert str(exc_info.value) == message
+    assert exc_info.value.body == parsed
+    assert exc_info.value.response.status_code == status
+
+
+def test_body_is_parsed_if_not_given():
+    client, _ = make_client(respond({"error": "Text is required"}, status=400))
+    response = client._session.get("https://testpad.example/api/v1/scripts/5")
+
+    error = exceptions.BadRequest(response)
+
+    assert str(error) == "Text is required"
+    assert error.body == {"error": "Text is required"}
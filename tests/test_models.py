@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from testpad import models
+
+UTC = timezone.utc
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2024-01-02T03:04:05Z", datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC)),
+        ("2024-01-02T03:04:05+00:00", datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC)),
+        (
+            "2024-01-02T03:04:05-05:30",
+            datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(-timedelta(hours=5.5))),
+        ),
+        ("2024-01-02T03:04:05", datetime(2024, 1, 2, 3, 4, 5)),
+        ("2024-01-02 03:04:05", datetime(2024, 1, 2, 3, 4, 5)),
+        ("2024-01-02", datetime(2024, 1, 2)),
+        # fractions of a second of any length, which Python 3.9 and 3.10 only accept as 3 or 6 digits
+        ("2024-01-02T03:04:05.1Z", datetime(2024, 1, 2, 3, 4, 5, 100000, UTC)),
+        ("2024-01-02T03:04:05.123Z", datetime(2024, 1, 2, 3, 4, 5, 123000, UTC)),
+        ("2024-01-02T03:04:05.12345Z", datetime(2024, 1, 2, 3, 4, 5, 123450, UTC)),
+        (
+            "2024-01-02T03:04:05.123456+01:00",
+            datetime(2024, 1, 2, 3, 4, 5, 123456, timezone(timedelta(hours=1))),
+        ),
+        ("2024-01-02T03:04:05.123456789Z", datetime(2024, 1, 2, 3, 4, 5, 123456, UTC)),
+    ],
+)
+def test_parse_datetime(value, expected):
+    parsed = models._parse_datetime(value)
+
+    assert type(parsed) is datetime
+    assert parsed == expected
+    assert parsed.utcoffset() == expected.utcoffset()
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["", "yesterday", "2024-13-01", "2024-01-02T25:00:00Z", None, 1704164645],
+)
+def test_invalid_values_are_unchanged(value):
+    assert models._parse_datetime(value) == value
+
+
+def test_datetimes_are_unchanged():
+    value = datetime(2024, 1, 2, tzinfo=UTC)
+
+    assert models._parse_datetime(value) is value
+
+
+def test_models_parse_timestamps():
+    project = models.Project.from_api(
+        {"id": 1, "name": "P", "description": "", "created": "2024-01-02T03:04:05.5Z"}
+    )
+    script = models.Script("script", 2, "S", "2024-01-02T03:04:05Z")
+    key = models.ApiKey(3, "label", "2025-01-01T00:00:00Z")
+
+    assert project.created == datetime(2024, 1, 2, 3, 4, 5, 500000, UTC)
+    assert script.created == datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC)
+    assert key.expires == datetime(2025, 1, 1, tzinfo=UTC)
+    assert models.ApiKey(3, "label").expires is None
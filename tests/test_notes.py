@@ -0,0 +1,68 @@
+import json
+import threading
+
+import pytest
+
+from testpad import exceptions, models
+
+from .testutils import make_client
+
+
+def _update_note(request):
+    note_id = request.path_url.rsplit("/", 1)[1]
+    if note_id.startswith("missing"):
+        return 404, None, {}
+    name = json.loads(request.body)["name"]
+    return 200, {"type": "note", "id": note_id, "name": name}, {}
+
+
+def test_bulk_update_returns_notes_in_order():
+    client, adapter = make_client(_update_note)
+    updates = {f"n{i}": f"Text {i}" for i in range(20)}
+
+    notes = client.bulk_update_project_notes(4, updates, max_workers=4)
+
+    assert notes == [
+        models.Note("note", note_id, name) for note_id, name in updates.items()
+    ]
+    requests = {request.url: json.loads(request.body) for request in adapter.requests}
+    assert len(adapter.requests) == 20
+    assert all(request.method == "PATCH" for request in adapter.requests)
+    assert requests == {
+        f"https://testpad.example/api/v1/projects/4/notes/{note_id}": {"name": name}
+        for note_id, name in updates.items()
+    }
+
+
+def test_bulk_update_runs_in_parallel():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def handler(request):
+        # each update waits until three are in progress at once
+        barrier.wait()
+        return _update_note(request)
+
+    client, _ = make_client(handler)
+
+    notes = client.bulk_update_project_notes(4, {"n1": "A", "n2": "B", "n3": "C"})
+
+    assert [note.name for note in notes] == ["A", "B", "C"]
+
+
+def test_bulk_update_with_no_updates_sends_nothing():
+    client, adapter = make_client(_update_note)
+
+    assert client.bulk_update_project_notes(4, {}) == []
+    assert adapter.requests == []
+
+
+def test_bulk_update_raises_if_an_update_fails():
+    client, adapter = make_client(_update_note)
+
+    with pytest.raises(exceptions.NotFound):
+        client.bulk_update_project_notes(
+            4, {"n1": "A", "missing": "B", "n3": "C"}, max_workers=1
+        )
+
+    # the other updates are still sent
+    assert len(adapter.requests) == 3
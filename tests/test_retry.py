@@ -0,0 +1,116 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from urllib3.util.retry import Retry
+
+from testpad import client as client_module
+from testpad import exceptions
+
+TEST = {"id": 1, "text": "A test", "indent": 0}
+
+
+class _Server:
+    """
+    A local HTTP server which answers with the given statuses in turn, and then with 200s
+    """
+
+    def __init__(self):
+        self.statuses = []
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                server.requests.append((self.command, self.path))
+                status = server.statuses.pop(0) if server.statuses else 200
+                if status == 200:
+                    body = {"test": TEST, "tests": [TEST]}
+                else:
+                    body = {}
+                content = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", "1")
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PATCH = _respond
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}/api/v1/"
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, args=(0.01,), daemon=True
+        )
+        self._thread.start()
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    # skip the backoff and Retry-After waits
+    monkeypatch.setattr(Retry, "sleep", lambda self, response=None: None)
+    server = _Server()
+    yield server
+    server.close()
+
+
+def test_get_is_retried_until_it_succeeds(server):
+    server.statuses = [503, 502, 504]
+    client = client_module.Testpad("token", api_url=server.url)
+
+    assert client.get_test(9, 1).text == "A test"
+    assert len(server.requests) == 4
+
+
+def test_rate_limit_is_raised_once_retries_run_out(server):
+    server.statuses = [429] * 10
+    client = client_module.Testpad("token", api_url=server.url)
+
+    with pytest.raises(exceptions.RateLimitExceeded) as exc_info:
+        client.get_test(9, 1)
+
+    assert exc_info.value.retry_after == 1
+    # the first attempt and 5 retries
+    assert len(server.requests) == 6
+
+
+def test_post_is_retried_when_rate_limited(server):
+    server.statuses = [429, 429]
+    client = client_module.Testpad("token", api_url=server.url)
+
+    assert client.append_test(9, "A test").id == 1
+    assert server.requests == [("POST", "/api/v1/scripts/9/tests")] * 3
+
+
+@pytest.mark.parametrize("status", [502, 503, 504])
+def test_post_is_not_retried_after_gateway_errors(server, status):
+    server.statuses = [status]
+    client = client_module.Testpad("token", api_url=server.url)
+
+    with pytest.raises(exceptions.UnexpectedResponse):
+        client.append_test(9, "A test")
+
+    assert len(server.requests) == 1
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_retry_zero_disables_retrying(server, status):
+    server.statuses = [status]
+    client = client_module.Testpad("token", api_url=server.url, retry=0)
+
+    with pytest.raises(exceptions.TestpadClientException):
+        client.get_test(9, 1)
+
+    assert len(server.requests) == 1
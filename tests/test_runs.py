@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from testpad import _json
+from testpad import client as client_module
+from testpad import models
+
+from .testutils import make_client, respond
+
+RUN = {"run": {"id": 3, "headers": {}, "results": {"1": {"result": "pass"}}}}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_encoder(request, monkeypatch):
+    """
+    Runs a test with request bodies encoded by orjson, if installed, and again by the json module
+    """
+    if request.param == "orjson":
+        if _json.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(
+            client_module, "json_dumps", lambda data: json.dumps(data).encode("utf-8")
+        )
+    return request.param
+
+
+def test_create_run_with_test_results(json_encoder):
+    client, adapter = make_client(respond(RUN))
+
+    run = client.create_run(
+        5,
+        headers={"build": "1.1.0"},
+        results={
+            "1": models.TestResult("pass"),
+            "2": models.TestResult("fail", comment="broken", issue="BUG-1"),
+        },
+    )
+
+    assert run.results == {"1": models.TestResult("pass", True)}
+    (request,) = adapter.requests
+    assert request.url == "https://testpad.example/api/v1/scripts/5/runs"
+    assert json.loads(request.body) == {
+        "headers": {"build": "1.1.0"},
+        "results": {
+            "1": {"result": "pass"},
+            "2": {"result": "fail", "comment": "broken", "issue": "BUG-1"},
+        },
+    }
+
+
+def test_create_run_with_plain_results(json_encoder):
+    client, adapter = make_client(respond(RUN))
+
+    client.create_run(5, results={"1": {"result": "pass"}})
+
+    assert json.loads(adapter.requests[0].body)["results"] == {"1": {"result": "pass"}}
+
+
+def test_retest_run(json_encoder):
+    client, adapter = make_client(respond(RUN))
+
+    client.retest_run(5, 2)
+
+    (request,) = adapter.requests
+    assert request.url == "https://testpad.example/api/v1/scripts/5/runs?retest=2"
+    assert json.loads(request.body) == {"headers": None, "results": None}
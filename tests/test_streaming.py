@@ -0,0 +1,84 @@
+import pytest
+
+from testpad import client as client_module
+from testpad import exceptions, models
+
+from .testutils import make_client, respond
+
+TESTS = {
+    "tests": [
+        {"id": 1, "text": "First", "indent": 0, "tags": ["a"], "score": 1.5},
+        {"id": 2, "text": "Second", "indent": 1, "notes": "note"},
+    ]
+}
+
+
+@pytest.fixture(params=["ijson", "fallback"])
+def streaming(request, monkeypatch):
+    """
+    Runs a test with incremental parsing by ijson, and again with the fallback of reading the whole body
+    """
+    if request.param == "ijson":
+        if client_module.ijson is None:
+            pytest.skip("ijson is not installed")
+    else:
+        monkeypatch.setattr(client_module, "ijson", None)
+    return request.param
+
+
+def test_iter_tests(streaming):
+    client, adapter = make_client(respond(TESTS))
+
+    tests = list(client.iter_tests(7))
+
+    assert tests == [
+        models.Test(1, "First", 0, ["a"]),
+        models.Test(2, "Second", 1, notes="note"),
+    ]
+    assert adapter.requests[0].url == "https://testpad.example/api/v1/scripts/7/tests"
+
+
+def test_list_tests(streaming):
+    client, _ = make_client(respond(TESTS))
+
+    assert [test.id for test in client.list_tests(7)] == [1, 2]
+
+
+def test_numbers_are_floats(streaming):
+    # ijson would give Decimals rather than floats without use_float
+    client, _ = make_client(respond(TESTS))
+
+    items = list(client._iter_get("scripts/7/tests", "tests"))
+
+    assert items[0]["score"] == 1.5
+    assert type(items[0]["score"]) is float
+
+
+def test_gzip_body_is_decoded(streaming):
+    client, _ = make_client(respond(TESTS, headers={"Content-Encoding": "gzip"}))
+
+    assert [test.text for test in client.iter_tests(7)] == ["First", "Second"]
+
+
+def test_error_response_raises(streaming):
+    client, _ = make_client(respond({"error": "nope"}, status=400))
+
+    with pytest.raises(exceptions.BadRequest) as exc_info:
+        list(client.iter_tests(7))
+
+    assert str(exc_info.value) == "nope"
+
+
+def test_iter_project_contents(streaming):
+    contents = {
+        "folders": [
+            {"type": "note", "id": "n1", "name": "A note"},
+            {"type": "folder", "id": "f1", "name": "Folder", "contents": []},
+        ]
+    }
+    client, _ = make_client(respond(contents))
+
+    assert list(client.iter_project_contents(3)) == [
+        models.Note("note", "n1", "A note"),
+        models.Folder("folder", "f1", "Folder", []),
+    ]
@@ -0,0 +1,138 @@
+import copy
+import sys
+
+import pytest
+
+from testpad import models
+from testpad._utils import endpoint_url, normalise_api_url, parse_folder_contents
+
+CREATED = "2024-01-02T03:04:05Z"
+
+
+def _script(script_id):
+    return {
+        "type": "script",
+        "id": script_id,
+        "name": f"S{script_id}",
+        "created": CREATED,
+    }
+
+
+def _note(note_id):
+    return {"type": "note", "id": note_id, "name": f"Note {note_id}"}
+
+
+def _folder(folder_id, *contents):
+    return {
+        "type": "folder",
+        "id": folder_id,
+        "name": folder_id,
+        "contents": list(contents),
+    }
+
+
+TREE = _folder(
+    "root",
+    _script(1),
+    _folder("a", _note("n1"), _folder("a1", _script(2)), _script(3)),
+    _note("n2"),
+    _folder("b"),
+    _script(4),
+)
+
+
+def test_nested_contents_keep_their_order():
+    folder = parse_folder_contents(TREE)
+
+    script = models.Script("script", 1, "S1", CREATED)
+    assert folder == models.Folder(
+        "folder",
+        "root",
+        "root",
+        [
+            script,
+            models.Folder(
+                "folder",
+                "a",
+                "a",
+                [
+                    models.Note("note", "n1", "Note n1"),
+                    models.Folder(
+                        "folder",
+                        "a1",
+                        "a1",
+                        [models.Script("script", 2, "S2", CREATED)],
+                    ),
+                    models.Script("script", 3, "S3", CREATED),
+                ],
+            ),
+            models.Note("note", "n2", "Note n2"),
+            models.Folder("folder", "b", "b", []),
+            models.Script("script", 4, "S4", CREATED),
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "item, expected",
+    [
+        (_script(1), models.Script("script", 1, "S1", CREATED)),
+        (_note("n1"), models.Note("note", "n1", "Note n1")),
+    ],
+)
+def test_top_level_leaf(item, expected):
+    assert parse_folder_contents(item) == expected
+
+
+def test_folder_without_contents():
+    item = {"type": "folder", "id": "f1", "name": "Folder"}
+
+    assert parse_folder_contents(item) == models.Folder("folder", "f1", "Folder", [])
+
+
+def test_input_is_not_changed():
+    tree = copy.deepcopy(TREE)
+
+    parse_folder_contents(tree)
+
+    assert tree == TREE
+
+
+@pytest.mark.parametrize(
+    "item",
+    [
+        {"type": "unknown", "id": 1},
+        _folder("root", _note("n1"), {"type": "unknown", "id": 1}),
+        _folder("root", _folder("a", _script(1), {"type": "unknown", "id": 1})),
+    ],
+)
+def test_unknown_type_raises(item):
+    with pytest.raises(ValueError, match="Unexpected type: unknown"):
+        parse_folder_contents(item)
+
+
+def test_deeper_than_recursion_limit():
+    depth = sys.getrecursionlimit() + 100
+    tree = _folder("0", _script(0))
+    for i in range(1, depth):
+        tree = _folder(str(i), _note(f"n{i}"), tree)
+
+    folder = parse_folder_contents(tree)
+
+    # walk down without recursion, as comparing or printing the folders would recurse
+    for i in reversed(range(1, depth)):
+        assert folder.id == str(i)
+        note, folder = folder.contents
+        assert note == models.Note("note", f"n{i}", f"Note n{i}")
+    assert folder.id == "0"
+    assert folder.contents == [models.Script("script", 0, "S0", CREATED)]
+
+
+@pytest.mark.parametrize("path", ["scripts/1", "/scripts/1"])
+@pytest.mark.parametrize(
+    "api_url", ["https://testpad.example/api/v1", "https://testpad.example/api/v1/"]
+)
+def test_endpoint_url(api_url, path):
+    url = endpoint_url(normalise_api_url(api_url), path)
+
+    assert url == "https://testpad.example/api/v1/scripts/1"
@@ -0,0 +1,66 @@
+import gzip
+import io
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from requests import PreparedRequest, Session
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from testpad import Testpad
+
+API_URL = "https://testpad.example/api/v1/"
+
+Body = Union[bytes, Dict[str, Any], List[Any], None]
+Handler = Callable[[PreparedRequest], Tuple[int, Body, Dict[str, str]]]
+
+
+class MockAdapter(HTTPAdapter):
+    """
+    A transport adapter which answers every request from a handler function instead of the network.
+
+    The handler is given the prepared request and returns (status, body, headers), where the body is
+    either bytes or something to encode as JSON. Every request sent is kept in `requests`.
+    """
+
+    def __init__(self, handler: Handler):
+        super().__init__()
+        self.handler = handler
+        self.requests: List[PreparedRequest] = []
+
+    def send(self, request: PreparedRequest, stream: bool = False, **kwargs):
+        self.requests.append(request)
+        status, body, headers = self.handler(request)
+        if body is None:
+            body = b""
+        elif not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        if headers.get("Content-Encoding") == "gzip":
+            body = gzip.compress(body)
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers=headers,
+            status=status,
+            preload_content=False,
+            decode_content=False,
+        )
+        return self.build_response(request, raw)
+
+
+def make_client(handler: Handler, **kwargs) -> Tuple[Testpad, MockAdapter]:
+    """
+    Returns a client which sends its requests to the given handler, and the adapter which records them
+    """
+    adapter = MockAdapter(handler)
+    session = Session()
+    session.mount("https://", adapter)
+    return Testpad("token", api_url=API_URL, session=session, **kwargs), adapter
+
+
+def respond(
+    body: Body, status: int = 200, headers: Optional[Dict[str, str]] = None
+) -> Handler:
+    """
+    Returns a handler which always answers with the same response
+    """
+    return lambda request: (status, body, headers or {})